@@ -1,12 +1,22 @@
 from pathlib import Path
 import json
+import logging
 import xml.etree.ElementTree as ET
 
+log = logging.getLogger("readmegen")
+
+# orjson заметно быстрее на больших JSON Google Benchmark, но не обязателен
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
 def parse_junit_xml(xml_path: Path) -> dict:
     """Парсит JUnit XML файл и возвращает сводку результатов."""
     try:
-        tree = ET.parse(xml_path)
-        root = tree.getroot()
+        # Потоковый разбор: из DOM нужны только атрибуты элементов <testsuite>
+        context = ET.iterparse(str(xml_path), events=("start", "end"))
+        _, root = next(context)
 
         # JUnit XML может иметь корневой элемент <testsuites> или <testsuite>
         total_tests = 0
@@ -15,16 +25,29 @@ def parse_junit_xml(xml_path: Path) -> dict:
         total_skipped = 0
 
         if root.tag == "testsuites":
-            for testsuite in root.findall("testsuite"):
-                total_tests += int(testsuite.get("tests", 0))
-                total_failures += int(testsuite.get("failures", 0))
-                total_errors += int(testsuite.get("errors", 0))
-                total_skipped += int(testsuite.get("skipped", 0))
+            depth = 0
+            for event, elem in context:
+                if event == "start":
+                    depth += 1
+                    if depth == 1 and elem.tag == "testsuite":
+                        total_tests += int(elem.get("tests", 0))
+                        total_failures += int(elem.get("failures", 0))
+                        total_errors += int(elem.get("errors", 0))
+                        total_skipped += int(elem.get("skipped", 0))
+                else:
+                    depth -= 1
+                    if depth == 0:
+                        # Освобождаем уже обработанные <testsuite>
+                        root.clear()
         elif root.tag == "testsuite":
             total_tests = int(root.get("tests", 0))
             total_failures = int(root.get("failures", 0))
             total_errors = int(root.get("errors", 0))
             total_skipped = int(root.get("skipped", 0))
+            # Дочитываем файл, чтобы ошибки разметки не остались незамеченными
+            for event, elem in context:
+                if event == "end":
+                    elem.clear()
         else:
             raise ValueError(f"Неизвестный корневой тег JUnit XML: {root.tag}")
 
@@ -37,14 +60,13 @@ def parse_junit_xml(xml_path: Path) -> dict:
             "passed": passed,
         }
     except (ET.ParseError, ValueError, FileNotFoundError) as e:
-        print(f"Ошибка при парсинге {xml_path}: {e}")
+        log.error(f"Ошибка при парсинге {xml_path}: {e}")
         return {"total": 0, "failures": 0, "errors": 0, "skipped": 0, "passed": False}
 
 def parse_benchmark_json(json_path: Path) -> dict:
     """Парсит Google Benchmark JSON файл и возвращает данные бенчмарков и информацию о системе."""
     try:
-        with open(json_path, 'r', encoding='utf-8') as f:
-            data = json.load(f)
+        data = _json_loads(Path(json_path).read_bytes())
 
         benchmarks = data.get("benchmarks", [])
         context = data.get("context", {})
@@ -61,5 +83,5 @@ def parse_benchmark_json(json_path: Path) -> dict:
             }
         }
     except (json.JSONDecodeError, FileNotFoundError) as e:
-        print(f"Ошибка при парсинге {json_path}: {e}")
+        log.error(f"Ошибка при парсинге {json_path}: {e}")
         return {"benchmarks": [], "system_info": {}}
\ No newline at end of file
@@ -1,96 +1,108 @@
+from functools import lru_cache
 from pathlib import Path
 import re
 
-def unwrap_delete_define_macro(text: str) -> str:
-    import re
+# Регулярные выражения компилируются один раз при загрузке модуля
+_RE_MACRO = re.compile(r'DELETE_DEFINE_MACRO\s*\(\s*((?:[^()]*|\([^()]*\))*)\s*\)\s*;?', re.DOTALL)
+_RE_GTEST_INCLUDE_LINE = re.compile(r'^.*#include\s+"gtest/gtest\.h".*//\[DELETE_DEFINE_MACRO\].*\n?', re.MULTILINE)
+_RE_INSERT_BODY = re.compile(r'INSERT_EXAMPLE_BODY\s*\(')
+_RE_DEFINE_MACROS = re.compile(r'^\s*#define\s+.*\n', re.MULTILINE)
+_RE_COUT = re.compile(r'COUT\s*\(\s*(.*?)\s*\)\s*;?')
+_RE_BLANKS = re.compile(r'\n\s*\n')
+_RE_TEST = re.compile(r'TEST\s*\([^)]*\)\s*\{', re.MULTILINE)
+_RE_NAMESPACE = re.compile(r'namespace\s+numsystem\s*\{[\s\S]*?\}\s*//\s*namespace\s+numsystem')
+_RE_BEGIN_MARK = re.compile(r'#define EXAMPLE_BEGIN_MARK')
+_RE_END_MARK = re.compile(r'#define EXAMPLE_END_MARK')
+_RE_EXAMPLE_MARKER = re.compile(r"\{\{EXAMPLE(\d+)\}\}")
+# Начало каждой непустой строки (строки из одних пробелов не сдвигаются)
+_INDENT_RE = re.compile(r'^(?=[^\S\n]*\S)', re.MULTILINE)
+
+# EXPECT_TRUE(...), #include "gtest/gtest.h" и блок #ifdef ENABLE_OUTPUT ... #endif
+# не зависят друг от друга и удаляются за один проход
+_RE_TEST_ONLY_CODE = re.compile(
+    r'EXPECT_TRUE\s*\([^)]*\)\s*;?'
+    r'|#include\s+"gtest/gtest.h"[^\n]*\n'
+    r'|#ifdef\s+ENABLE_OUTPUT\b.*?#endif',
+    re.DOTALL
+)
+
 
+def unwrap_delete_define_macro(text: str) -> str:
     # 1) Разворачиваем вызовы DELETE_DEFINE_MACRO(...) как раньше
-    pattern_macro = r'DELETE_DEFINE_MACRO\s*\(\s*((?:[^()]*|\([^()]*\))*)\s*\)\s*;?'
-    text = re.sub(pattern_macro, lambda m: m.group(1), text, flags=re.DOTALL)
+    text = _RE_MACRO.sub(lambda m: m.group(1), text)
 
     # 2) Удаляем строки, содержащие '#include "gtest/gtest.h"' и комментарий //[DELETE_DEFINE_MACRO]
-    pattern_gtest_include = r'^.*#include\s+"gtest/gtest\.h".*//\[DELETE_DEFINE_MACRO\].*\n?'
-    text = re.sub(pattern_gtest_include, '', text, flags=re.MULTILINE)
+    text = _RE_GTEST_INCLUDE_LINE.sub('', text)
 
     return text
 
 
 
+def _find_matching_bracket(text: str, open_pos: int, opening: str = '{', closing: str = '}') -> int:
+    """
+    Возвращает позицию скобки, парной открывающей скобке text[open_pos],
+    или -1, если пара не найдена. Строка просматривается один раз через str.find.
+    """
+    depth = 0
+    next_open = open_pos
+    next_close = text.find(closing, open_pos)
+    while next_close != -1:
+        if next_open != -1 and next_open < next_close:
+            depth += 1
+            next_open = text.find(opening, next_open + 1)
+        else:
+            depth -= 1
+            if depth == 0:
+                return next_close
+            next_close = text.find(closing, next_close + 1)
+    return -1
+
+
 def unwrap_insert_example_body(text: str) -> str:
     """
     Находит все вхождения INSERT_EXAMPLE_BODY(...),
     корректно учитывая вложенные скобки,
     и заменяет вызов на содержимое между скобками, без самих скобок.
     """
-    import re
-
-    pattern = re.compile(r'INSERT_EXAMPLE_BODY\s*\(')
-
+    parts = []
     pos = 0
-    result = ''
-    while True:
-        match = pattern.search(text, pos)
-        if not match:
-            result += text[pos:]
-            break
-        
-        start = match.end()  # позиция после открывающей скобки '('
-        depth = 1
-        i = start
-        while i < len(text) and depth > 0:
-            if text[i] == '(':
-                depth += 1
-            elif text[i] == ')':
-                depth -= 1
-            i += 1
-
-        if depth != 0:
-            # Ошибка: не нашли закрывающую скобку, вставляем остаток и выходим
-            result += text[pos:]
+    for match in _RE_INSERT_BODY.finditer(text):
+        if match.start() < pos:
+            # Вызов вложен в уже развёрнутый — оставляем его как есть
+            continue
+
+        end = _find_matching_bracket(text, match.end() - 1, '(', ')')
+        if end == -1:
+            # Ошибка: не нашли закрывающую скобку, вставляем остаток как есть
             break
 
-        # Вырезаем содержимое между скобками
-        inner_content = text[start:i-1]
-
         # Добавляем всё до начала вызова + содержимое без скобок
-        result += text[pos:match.start()] + inner_content
+        parts.append(text[pos:match.start()])
+        parts.append(text[match.end():end])
 
-        pos = i  # продолжаем после закрывающей скобки
+        pos = end + 1  # продолжаем после закрывающей скобки
 
-    return result
+    parts.append(text[pos:])
+    return ''.join(parts)
 
 
 
-def remove_expect_true(text):
-    return re.sub(r'EXPECT_TRUE\s*\([^)]*\)\s*;?', '', text)
-
-def remove_gtest_include(text):
-    return re.sub(r'#include\s+"gtest/gtest.h".*\n', '', text)
+def remove_test_only_code(text):
+    # Удаляет EXPECT_TRUE(...), #include "gtest/gtest.h" и блок #ifdef ENABLE_OUTPUT ... #endif
+    return _RE_TEST_ONLY_CODE.sub('', text)
 
 def remove_define_macros(text):
     # Удаляет все строки, начинающиеся с #define EXAMPLE_BEGIN_MARK, #define DELETE_DEFINE_MACRO и т.д.
-    return re.sub(r'^\s*#define\s+.*\n', '', text, flags=re.MULTILINE)
+    return _RE_DEFINE_MACROS.sub('', text)
 
 def process_test_blocks_to_main(text):
-    def find_matching_brace(s, start_pos):
-        depth = 0
-        for i in range(start_pos, len(s)):
-            if s[i] == '{':
-                depth += 1
-            elif s[i] == '}':
-                depth -= 1
-                if depth == 0:
-                    return i
-        return -1
-
-    pattern = re.compile(r'TEST\s*\([^)]*\)\s*\{', re.MULTILINE)
-    match = pattern.search(text)
+    match = _RE_TEST.search(text)
 
     if not match:
         return text
 
     start_body = match.end()
-    end_brace_pos = find_matching_brace(text, start_body - 1)
+    end_brace_pos = _find_matching_bracket(text, start_body - 1)
 
     if end_brace_pos == -1:
         return text
@@ -98,14 +110,12 @@ def process_test_blocks_to_main(text):
     test_body = text[start_body:end_brace_pos]
 
     # Удаляем namespace numsystem
-    namespace_pattern = r'namespace\s+numsystem\s*\{(?:.|\n)*?\}\s*//\s*namespace\s+numsystem'
-    text = re.sub(namespace_pattern, '', text, flags=re.DOTALL)
-
-    # Функция для сдвига строк на 4 пробела
-    def indent_lines(s, indent='    '):
-        return '\n'.join(indent + line if line.strip() else '' for line in s.splitlines())
+    text = _RE_NAMESPACE.sub('', text)
 
-    indented_body = indent_lines(test_body)
+    # Сдвигаем непустые строки на 4 пробела. Последний перевод строки отбрасываем,
+    # как это делал splitlines(), иначе перед return 0; появится лишняя пустая строка.
+    # Пробельные строки схлопывает общая чистка пустых строк в конце.
+    indented_body = _INDENT_RE.sub('    ', test_body.removesuffix('\n'))
 
     main_function_code = f"""int main() {{
 {indented_body}
@@ -113,12 +123,12 @@ def process_test_blocks_to_main(text):
 }}"""
 
     # Удаляем маркеры
-    text = re.sub(r'#define EXAMPLE_BEGIN_MARK', '', text)
-    text = re.sub(r'#define EXAMPLE_END_MARK', '', text)
+    text = _RE_BEGIN_MARK.sub('', text)
+    text = _RE_END_MARK.sub('', text)
 
     # Возвращаем исходный текст без TEST(...) {...} плюс main()
     # Можно убрать TEST-блок из текста, чтобы не дублировался
-    text_without_test = pattern.sub('', text)
+    text_without_test = _RE_TEST.sub('', text)
     text_without_test = text_without_test[:start_body-5] + text_without_test[end_brace_pos+1:]  # вырезаем тело теста
 
     return text_without_test.strip() + '\n\n' + main_function_code
@@ -126,41 +136,38 @@ def process_test_blocks_to_main(text):
 
 def replace_cout(text):
     # Заменяет COUT(...) на std::cout << ...;
-    pattern = r'COUT\s*\(\s*(.*?)\s*\)\s*;?'
-    return re.sub(pattern, r'std::cout << \1;', text)
-
-def remove_ifdef_block(text: str, macro_name: str) -> str:
-    pattern = re.compile(
-        rf'#ifdef\s+{macro_name}\b.*?#endif', 
-        flags=re.DOTALL
-    )
-    return pattern.sub('', text)
+    return _RE_COUT.sub(r'std::cout << \1;', text)
 
 
 def preprocess_cpp_code(text: str) -> str:
     text = unwrap_delete_define_macro(text)
     text = unwrap_insert_example_body(text)  
-    text = remove_expect_true(text)
-    text = remove_gtest_include(text)
-    text = remove_ifdef_block(text, 'ENABLE_OUTPUT') 
+    text = remove_test_only_code(text)
     text = process_test_blocks_to_main(text)
     text = replace_cout(text)
     text = remove_define_macros(text)
-    text = re.sub(r'\n\s*\n', '\n\n', text).strip()
+    text = _RE_BLANKS.sub('\n\n', text).strip()
     return text
 
 
 
+@lru_cache(maxsize=None)
+def _load_processed(path_str: str) -> str:
+    # Один и тот же пример может встречаться в шаблоне несколько раз
+    return preprocess_cpp_code(Path(path_str).read_text(encoding='utf-8'))
+
+
 def insert_examples(template: str, examples_dir: Path) -> str:
+    if '{{EXAMPLE' not in template:
+        return template
+
     def replacer(match):
         index = match.group(1)
         example_path = examples_dir / f"ex-{index}.cpp"
         if example_path.exists():
-            with open(example_path, 'r', encoding='utf-8') as f:
-                code = f.read()
-            processed_code = preprocess_cpp_code(code)
+            processed_code = _load_processed(str(example_path.resolve()))
             # Добавляем markdown блок с языком cpp
             return f"\n```cpp\n{processed_code}\n```\n"
         else:
             return f"// Example ex-{index}.cpp not found"
-    return re.sub(r"\{\{EXAMPLE(\d+)\}\}", replacer, template)
+    return _RE_EXAMPLE_MARKER.sub(replacer, template)
@@ -1,7 +1,10 @@
 import sys
 import os
 import argparse
+import logging
+import re
 from pathlib import Path
+from concurrent.futures import ThreadPoolExecutor
 from ci_parser import parse_junit_xml, parse_benchmark_json
 from generators.compatibility import generate_compatibility_table
 from generators.system_info import generate_benchmark_system_info_table
@@ -15,6 +18,12 @@ project_root = os.path.abspath(os.path.join(script_dir, '..', '..'))
 if project_root not in sys.path:
     sys.path.insert(0, project_root)
 
+log = logging.getLogger("readmegen")
+
+EXPECTED_COMBINATIONS = ("ubuntu-latest-gcc", "ubuntu-latest-clang", "windows-latest-msvc")
+
+_TEMPLATE_RE = re.compile(r"\{\{(COMPATIBILITY_TABLE|SYSTEM_INFO|BENCHMARK_TABLE)\}\}")
+
 
 def parse_arguments():
     parser = argparse.ArgumentParser(description="Генерация README.md на основе результатов CI.")
@@ -26,7 +35,7 @@ def parse_arguments():
 
 def check_input_paths(input_base_path: Path, template_path: Path) -> Path | None:
     if not input_base_path.exists():
-        print(f"[ERROR] Каталог артефактов '{input_base_path}' не найден.")
+        log.error(f"Каталог артефактов '{input_base_path}' не найден.")
         return None
 
     if template_path.is_dir():
@@ -35,108 +44,107 @@ def check_input_paths(input_base_path: Path, template_path: Path) -> Path | None
     return template_path
 
 
-def process_artifacts(input_base_path: Path, expected_combinations: list[str]):
-    print("[INFO] Начинаю сбор данных из каталогов артефактов... ", end="", flush=True)
-    results = {}
+def load_combination(input_base_path: Path, combo: str) -> tuple[dict, str]:
+    """Парсит артефакты одной конфигурации и возвращает данные и строку статуса."""
+    combo_path = input_base_path / combo
+    test_xml = combo_path / ".project" / "rtest-junit.xml"
+    bench_json = combo_path / ".project" / "rbenchmark.json"
 
-    for combo in expected_combinations:
-        print(f"\n  Обрабатываю конфигурацию: {combo} ... ", end="", flush=True)
-        combo_path = input_base_path / combo
-        test_xml = combo_path / ".project" / "rtest-junit.xml"
-        bench_json = combo_path / ".project" / "rbenchmark.json"
-
-        test_results = {"total": 0, "failures": 0, "errors": 0, "skipped": 0, "passed": False}
-        benchmark_data = {"benchmarks": [], "system_info": {}}
-
-        if combo_path.is_dir():
-            if test_xml.is_file():
-                print("парсю тесты... ", end="", flush=True)
-                test_results = parse_junit_xml(test_xml)
-                print("ok", end=", ", flush=True)
-            else:
-                print("тесты отсутствуют", end=", ", flush=True)
-
-            if bench_json.is_file():
-                print("парсю бенчмарки... ", end="", flush=True)
-                benchmark_data = parse_benchmark_json(bench_json)
-                print("ok", end="", flush=True)
-            else:
-                print("бенчмарки отсутствуют", end="", flush=True)
+    test_results = {"total": 0, "failures": 0, "errors": 0, "skipped": 0, "passed": False}
+    benchmark_data = {"benchmarks": [], "system_info": {}}
+
+    if combo_path.is_dir():
+        if test_xml.is_file():
+            test_results = parse_junit_xml(test_xml)
+            status = "тесты ok, "
         else:
-            print("каталог отсутствует", end="", flush=True)
+            status = "тесты отсутствуют, "
 
-        results[combo] = {
-            "test_results": test_results,
-            "benchmark_results": benchmark_data.get("benchmarks", []),
-            "system_info": benchmark_data.get("system_info", {})
-        }
+        if bench_json.is_file():
+            benchmark_data = parse_benchmark_json(bench_json)
+            status += "бенчмарки ok"
+        else:
+            status += "бенчмарки отсутствуют"
+    else:
+        status = "каталог отсутствует"
 
-    print("\n[INFO] Сбор данных завершён. ok")
+    payload = {
+        "test_results": test_results,
+        "benchmark_results": benchmark_data.get("benchmarks", []),
+        "system_info": benchmark_data.get("system_info", {})
+    }
+    return payload, status
+
+
+def process_artifacts(input_base_path: Path, expected_combinations: tuple[str, ...]):
+    log.info("Начинаю сбор данных из каталогов артефактов...")
+    results = {}
+
+    # Конфигурации независимы, поэтому разбираем их параллельно,
+    # а статус печатаем из основного потока в исходном порядке
+    with ThreadPoolExecutor(max_workers=min(4, len(expected_combinations)) or 1) as executor:
+        loaded = executor.map(lambda combo: load_combination(input_base_path, combo), expected_combinations)
+        for combo, (payload, status) in zip(expected_combinations, loaded):
+            log.info(f"  {combo}: {status}")
+            results[combo] = payload
+
+    log.info("Сбор данных завершён.")
     return results
 
 
 def should_abort_due_to_failed_ci(results: dict) -> bool:
-    for combo, data in results.items():
-        if data["test_results"]["total"] == 0:
-            print(f"[ERROR] CI для '{combo}' не выполнил тесты. Прерывание генерации README.")
-            return True
+    failed = next((combo for combo, data in results.items() if data["test_results"]["total"] == 0), None)
+    if failed is not None:
+        log.error(f"CI для '{failed}' не выполнил тесты. Прерывание генерации README.")
+        return True
     return False
 
 
 def generate_sections(results: dict):
-    print("[INFO] Генерирую таблицу совместимости... ", end="", flush=True)
     compatibility = generate_compatibility_table(results)
-    print("ok")
 
-    print("[INFO] Генерирую информацию о системе... ", end="", flush=True)
     system_info_dict = {k: v["system_info"] for k, v in results.items() if v["system_info"]}
     if system_info_dict:
         system_info = generate_benchmark_system_info_table(system_info_dict)
-        print("ok")
+        system_info_status = "ok"
     else:
         system_info = "Информация о системе для бенчмарков недоступна.\n"
-        print("отсутствует")
+        system_info_status = "отсутствует"
 
-    print("[INFO] Генерирую таблицу бенчмарков... ", end="", flush=True)
     benchmark_table = generate_benchmark_table(results)
-    print("ok")
+
+    log.info(f"Разделы сгенерированы: совместимость ok, информация о системе {system_info_status}, бенчмарки ok")
 
     return compatibility, system_info, benchmark_table
 
 
 def build_readme(template_path: Path, output_path: Path, compatibility_md: str, system_info_md: str, benchmark_md: str):
     try:
-        print(f"[INFO] Читаю шаблон из {template_path} ... ", end="", flush=True)
-        with open(template_path, 'r', encoding='utf-8') as f:
-            template = f.read()
-        print("ok")
+        log.info(f"Читаю шаблон из {template_path}")
+        template = template_path.read_text(encoding='utf-8')
 
-        print("[INFO] Заменяю макросы... ", end="", flush=True)
-        readme = template.replace("{{COMPATIBILITY_TABLE}}", compatibility_md)
-        readme = readme.replace("{{SYSTEM_INFO}}", system_info_md)
-        readme = readme.replace("{{BENCHMARK_TABLE}}", benchmark_md)
-        print("ok")
+        subs = {
+            "COMPATIBILITY_TABLE": compatibility_md,
+            "SYSTEM_INFO": system_info_md,
+            "BENCHMARK_TABLE": benchmark_md,
+        }
+        readme = _TEMPLATE_RE.sub(lambda m: subs[m.group(1)], template) if '{{' in template else template
 
         examples_path = Path(project_root) / "tests" / "examples"
-        print(f"[INFO] Вставляю примеры из {examples_path} ... ", end="", flush=True)
+        log.info(f"Заменяю макросы и вставляю примеры из {examples_path}")
         readme = insert_examples(readme, examples_path)
-        print("ok")
 
-        print(f"[INFO] Записываю README в {output_path} ... ", end="", flush=True)
-        with open(output_path, 'w', encoding='utf-8') as f:
-            f.write(readme)
-        print("ok")
+        output_path.write_text(readme, encoding='utf-8')
 
-        print(f"\n[УСПЕХ] README.md сгенерирован по пути: {output_path.resolve()}")
+        log.info(f"README.md сгенерирован по пути: {output_path.resolve()}")
 
     except Exception as e:
-        print(f"\n[ОШИБКА] {type(e).__name__}: {e}")
+        log.error(f"{type(e).__name__}: {e}")
 
 
 def main():
-    print("=" * 50)
-    print("🛠️  Генерация README.md запущена")
-    print("=" * 50)
+    logging.basicConfig(level=logging.INFO, format="[%(levelname)s] %(message)s")
+    log.info("🛠️  Генерация README.md запущена")
 
     args = parse_arguments()
     input_base = Path(args.input_folder)
@@ -145,11 +153,10 @@ def main():
     if not template_path:
         return
 
-    expected_combinations = ["ubuntu-latest-gcc", "ubuntu-latest-clang", "windows-latest-msvc"]
-    results = process_artifacts(input_base, expected_combinations)
+    results = process_artifacts(input_base, EXPECTED_COMBINATIONS)
 
     if should_abort_due_to_failed_ci(results):
-        print("[WARNING] Некоторые CI не выполнили тесты, но README будет сгенерирован с доступными данными.")
+        log.warning("Некоторые CI не выполнили тесты, README не будет сгенерирован.")
         return
 
     compatibility, system_info, benchmark = generate_sections(results)
@@ -1,12 +1,26 @@
+# Порядок столбцов и их подписи в таблице
+_PLATFORM_ORDER = ("ubuntu-latest-gcc", "ubuntu-latest-clang", "windows-latest-msvc")
+_DISPLAY_NAMES = {
+    "ubuntu-latest-gcc": "Ubuntu (GCC)",
+    "ubuntu-latest-clang": "Ubuntu (Clang)",
+    "windows-latest-msvc": "Windows (MSVC)",
+}
+
 def generate_benchmark_table(results: dict) -> str:
     """Генерирует Markdown таблицу с результатами бенчмарков в миллисекундах, выделяя лучшее время."""
 
-    all_benchmark_names = set()
-    for data in results.values():
+    # Один проход по результатам каждой платформы: префикс имени -> [сумма real_time, количество]
+    buckets: dict[str, dict[str, list]] = {}
+    for platform_key, data in results.items():
+        platform_buckets = buckets.setdefault(platform_key, {})
         for bm in data.get("benchmark_results", []):
             if bm.get("run_type") == "aggregate":
                 continue
-            all_benchmark_names.add(bm["name"].split('/')[0])
+            entry = platform_buckets.setdefault(bm["name"].split('/', 1)[0], [0.0, 0])
+            entry[0] += bm["real_time"]
+            entry[1] += 1
+
+    all_benchmark_names = set().union(*(d.keys() for d in buckets.values()))
 
     if not all_benchmark_names:
         return "Данные бенчмарков недоступны.\n"
@@ -14,46 +28,26 @@ def generate_benchmark_table(results: dict) -> str:
     sorted_benchmark_names = sorted(all_benchmark_names)
 
     # Заголовок с указанием измерения в миллисекундах (ms)
-    header = "| Операция        "
-    separator = "|-----------------"
-    
-    platform_cols = []
-    platform_order = []
-    if "ubuntu-latest-gcc" in results:
-        platform_order.append("ubuntu-latest-gcc")
-    if "ubuntu-latest-clang" in results:
-        platform_order.append("ubuntu-latest-clang")
-    if "windows-latest-msvc" in results:
-        platform_order.append("windows-latest-msvc")
-
-    display_names = {
-        "ubuntu-latest-gcc": "Ubuntu (GCC)",
-        "ubuntu-latest-clang": "Ubuntu (Clang)",
-        "windows-latest-msvc": "Windows (MSVC)",
-    }
+    header_parts = ["| Операция        "]
+    separator_parts = ["|-----------------"]
 
-    for platform_key in platform_order:
-        header += f"| {display_names.get(platform_key, platform_key):<18}, ms "
-        separator += f"|{'-'*23}-"
-        platform_cols.append(platform_key)
+    platform_cols = [p for p in _PLATFORM_ORDER if p in results]
+    for platform_key in platform_cols:
+        header_parts.append(f"| {_DISPLAY_NAMES[platform_key]:<18}, ms ")
+        separator_parts.append(f"|{'-'*23}-")
 
-    header += "|\n"
-    separator += "|\n"
+    header = "".join(header_parts) + "|\n"
+    separator = "".join(separator_parts) + "|\n"
 
     table_rows = []
     for bm_name_prefix in sorted_benchmark_names:
-        row = f"| {bm_name_prefix:<15} "
+        row_parts = [f"| {bm_name_prefix:<15} "]
         times_list = []
 
         # Считаем среднее время для каждой платформы, конвертируем из нс в мс
         for platform_key in platform_cols:
-            platform_data = results.get(platform_key, {}).get("benchmark_results", [])
-            times = [
-                bm["real_time"]
-                for bm in platform_data
-                if bm.get("run_type") != "aggregate" and bm["name"].startswith(bm_name_prefix)
-            ]
-            avg_time_ns = sum(times) / len(times) if times else None
+            total_ns, count = buckets[platform_key].get(bm_name_prefix, (0.0, 0))
+            avg_time_ns = total_ns / count if count else None
             avg_time_ms = avg_time_ns / 1_000_000 if avg_time_ns is not None else None
             times_list.append(avg_time_ms)
 
@@ -69,8 +63,8 @@ def generate_benchmark_table(results: dict) -> str:
                 cell = f"**{t:.2f}**"
             else:
                 cell = f"{t:.2f}"
-            row += f"| {cell:<23} "
-        row += "|\n"
-        table_rows.append(row)
+            row_parts.append(f"| {cell:<23} ")
+        row_parts.append("|\n")
+        table_rows.append("".join(row_parts))
 
-    return header + separator + "".join(table_rows)
+    return "".join([header, separator, *table_rows])
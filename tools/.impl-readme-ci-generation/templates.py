@@ -1,9 +1,13 @@
+from pathlib import Path
+import re
+
+
 def apply_template(template_path, output_path, substitutions: dict):
-    with open(template_path, 'r', encoding='utf-8') as f:
-        content = f.read()
+    content = Path(template_path).read_text(encoding='utf-8')
 
-    for key, value in substitutions.items():
-        content = content.replace(f"{{{{{key}}}}}", value)
+    if substitutions and '{{' in content:
+        # Все макросы {{KEY}} заменяются за один проход по шаблону
+        pattern = re.compile("|".join(re.escape("{{" + key + "}}") for key in substitutions))
+        content = pattern.sub(lambda m: substitutions[m.group(0)[2:-2]], content)
 
-    with open(output_path, 'w', encoding='utf-8') as f:
-        f.write(content)
+    Path(output_path).write_text(content, encoding='utf-8')
@@ -1,8 +1,22 @@
 from datetime import datetime
+from functools import lru_cache
 
 
 def format_datetime(dt_str):
-    # Парсим ISO и возвращаем в формате ГГГГ-ММ-ДД ЧЧ:ММ:СС
+    # Не-строки (None, списки и т.п.) возвращаем как есть, не передавая в кеш:
+    # lru_cache не принимает нехешируемые аргументы
+    if not isinstance(dt_str, str):
+        return dt_str
+    return _format_iso_datetime(dt_str)
+
+@lru_cache(maxsize=256)
+def _format_iso_datetime(dt_str):
+    # Быстрый путь для ISO вида 2024-01-15T10:30:45[.ffffff][+ЧЧ:ММ]: хватает срезов строки
+    if (len(dt_str) >= 19 and dt_str[10] == "T"
+            and dt_str[4] == dt_str[7] == "-" and dt_str[13] == dt_str[16] == ":"):
+        return f"{dt_str[:10]} {dt_str[11:19]}"
+
+    # Иначе парсим ISO и возвращаем в формате ГГГГ-ММ-ДД ЧЧ:ММ:СС
     try:
         dt = datetime.fromisoformat(dt_str)
         return dt.strftime("%Y-%m-%d %H:%M:%S")
@@ -10,11 +24,10 @@ def format_datetime(dt_str):
         return dt_str  # если парсинг не удался, возвращаем как есть
 
 def format_cache_entry(cache):
-    level = cache.get("level", "N/A")
-    ctype = cache.get("type", "N/A")
-    size_bytes = cache.get("size", 0)
-    size_kb = size_bytes // 1024
-    sharing = cache.get("num_sharing", "N/A")
-
-    # Формат: 32KB(2sh)
-    return f"{size_kb}KB({sharing}sh)"
\ No newline at end of file
+    # Формат: 32KB(2sh); в JSON Google Benchmark оба поля обычно присутствуют
+    try:
+        return f"{cache['size'] >> 10}KB({cache['num_sharing']}sh)"
+    except KeyError:
+        size_kb = cache.get("size", 0) >> 10
+        sharing = cache.get("num_sharing", "N/A")
+        return f"{size_kb}KB({sharing}sh)"
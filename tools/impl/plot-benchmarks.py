@@ -1,14 +1,34 @@
 import os
-import json
 import argparse
-import re
-import matplotlib.pyplot as plt
+from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from pathlib import Path
+import numpy as np
+
+# orjson разбирает большие JSON Google Benchmark заметно быстрее, но не обязателен
+try:
+    from orjson import loads as _json_loads
+except ImportError:
+    from json import loads as _json_loads
+
+# ijson позволяет читать записи по одной, не загружая весь документ
+try:
+    import ijson
+except ImportError:
+    ijson = None
+
+# Суффиксы имён агрегированных записей Google Benchmark
+_AGGREGATE_SUFFIXES = ("_mean", "_median", "_stddev", "_cv", "_BigO", "_RMS")
+
+# Системы, которые должны быть на каждом графике
+_REQUIRED_SYSTEMS = frozenset(("Binary", "Factorial"))
 
 def parse_args():
     """
     Разбираем аргументы командной строки:
       1) --input  : путь к rbenchmark.json
       2) --output : путь к папке, куда сохранять графики
+      3) --format : формат графиков, svg (по умолчанию) или png
     Если папки output нет – создаём её.
     """
     parser = argparse.ArgumentParser(
@@ -26,139 +46,182 @@ def parse_args():
         required=True,
         help="Путь к директории для сохранения графиков"
     )
+    parser.add_argument(
+        "--format",
+        "-f",
+        choices=("svg", "png"),
+        default="svg",
+        help="Формат графиков: svg (векторный) или png"
+    )
     args = parser.parse_args()
 
     # Проверка: существует ли входной JSON-файл
-    if not os.path.isfile(args.input):
-        print(f"[ERROR] File not found: {args.input}")
-        sys.exit(1)
+    if not Path(args.input).is_file():
+        parser.error(f"File not found: {args.input}")
 
     # Если папки нет, создаём
-    if not os.path.isdir(args.output):
-        os.makedirs(args.output, exist_ok=True)
+    Path(args.output).mkdir(parents=True, exist_ok=True)
     return args
 
-def load_data(path):
+def iter_benchmarks(path):
     """
-    Считываем JSON из файла и возвращаем список записей (benchmarks).
+    Последовательно отдаём записи (benchmarks) из JSON-файла.
+    Если установлен ijson, файл разбирается потоково, иначе загружается целиком.
     """
-    with open(path, "r", encoding="utf-8") as f:
-        data = json.load(f)
-    # В формате Google Benchmark данные лежат в ключе "benchmarks"
-    return data.get("benchmarks", [])
-
-def extract_info(entry):
-    """
-    Извлекаем из поля 'name' три компонента:
-      - system (Binary или Factorial)
-      - operation (Add, Sub, Mul, Div, Mod, Comparison)
-      - size (число, например 10, 16, 32...)
-    Ожидаем, что name формата: "Binary-Add/10/min_time:0.010"
-    """
-    name = entry.get("name", "")
-    m = re.match(r"(?P<system>\w+)-(?P<op>\w+)/(?P<size>\d+)", name)
-    if not m:
-        return None, None, None
-    system = m.group("system")
-    op = m.group("op")
-    size = int(m.group("size"))
-    return system, op, size
+    with open(path, "rb") as f:
+        # В формате Google Benchmark данные лежат в ключе "benchmarks"
+        if ijson is not None:
+            yield from ijson.items(f, "benchmarks.item", use_float=True)
+        else:
+            yield from _json_loads(f.read()).get("benchmarks", [])
 
 def collect_data(benchmarks):
     """
-    Собираем из списка benchmarks словарь вида:
-      data[operation][system] = list of (size, real_time)
+    Собираем из последовательности записей benchmarks словарь вида:
+      data[operation][system] = (sizes, real_times) – массивы NumPy, упорядоченные по size
     Где operation – строка "Add", "Sub", ...
     system – "Binary" или "Factorial"
-    Оставляем только записи run_type == "iteration".
+    Оставляем только записи run_type == "iteration" и только операции,
+    для которых есть данные обеих систем.
+    Поле name должно иметь формат "Binary-Add/10/min_time:0.010".
     """
-    data = {}
+    # Серии храним по столбцам: (operation, system) -> (sizes, times)
+    series = defaultdict(lambda: ([], []))
+    systems_per_op = defaultdict(set)
     for entry in benchmarks:
-        if entry.get("run_type") != "iteration":
+        # Агрегаты отсекаем по имени, не разбирая его
+        name = entry.get("name", "")
+        if name.endswith(_AGGREGATE_SUFFIXES) or entry.get("run_type") != "iteration":
             continue
 
-        system, op, size = extract_info(entry)
-        if system is None:
+        # "Binary-Add/10/min_time:0.010" -> "Binary-Add", "10/min_time:0.010"
+        head, _, tail = name.partition("/")
+        size_str, _, _ = tail.partition("/")
+        system, _, op = head.partition("-")
+        if not system or not op or not size_str.isdecimal():
             continue  # если не удалось распознать формат имени
+        size = int(size_str)
 
         real_time = entry.get("real_time", None)
         if real_time is None:
             continue
 
-        # Инициализируем вложенные словари
-        data.setdefault(op, {})
-        data[op].setdefault(system, [])
-        # Добавляем кортеж (size, real_time)
-        data[op][system].append((size, real_time))
+        sizes, times = series[(op, system)]
+        if not sizes:
+            systems_per_op[op].add(system)
+        sizes.append(size)
+        times.append(real_time)
 
-    # Сортируем по size внутри каждой пары (чтобы график строился «по возрастанию»)
-    for op in data:
-        for system in data[op]:
-            data[op][system].sort(key=lambda x: x[0])
+    # Неполные операции отбрасываем без сортировки и преобразования
+    complete_ops = {op for op, systems in systems_per_op.items() if _REQUIRED_SYSTEMS <= systems}
+
+    # Раскладываем серии по операциям и сортируем по size (чтобы график строился «по возрастанию»)
+    data = {}
+    for (op, system), (sizes, times) in series.items():
+        if op not in complete_ops:
+            continue
+        sizes = np.array(sizes, dtype=np.int32)
+        times = np.array(times, dtype=np.float64)
+        order = np.argsort(sizes, kind="stable")
+        data.setdefault(op, {})[system] = (sizes[order], times[order])
 
     return data
 
-def plot_operation(op_name, sys_data, output_dir):
+def plot_operation(op_name, sys_data, output_dir, ax, fmt="svg"):
     """
     Для одной операции op_name (например, "Add") строим график:
-      - sys_data: словарь { "Binary": [(size, time), ...], "Factorial": [...] }
-      - Сохраняем в файл f"{output_dir}/график_{op_name}.png"
+      - sys_data: словарь { "Binary": (sizes, times), "Factorial": (sizes, times) }
+      - ax: оси общей фигуры, очищаются перед построением
+      - Сохраняем в файл f"{output_dir}/chart_{op_name}.{fmt}"
     Подписи:
       X: Размер числа (количество условных единиц)
       Y: Время выполнения, нс (логарифмический масштаб)
     Легенда: "Бинарная система" и "Факториальная система"
     """
-    plt.figure(figsize=(8, 6))
+    ax.clear()
 
     # Цвета и стили линий можно поменять, но не задаём вручную, чтобы не нарушать ГОСТ.
-    for system, points in sys_data.items():
-        sizes = [p[0] for p in points]
-        times = [p[1] for p in points]
+    for system, (sizes, times) in sys_data.items():
         label = "Бинарная система" if system == "Binary" else "Факториальная система"
-        plt.plot(
+        # На длинных сериях рисуем не больше ~20 маркеров, линия остаётся полной
+        n = len(sizes)
+        ax.plot(
             sizes,
             times,
             marker="o",
+            markevery=max(1, n // 20) if n > 20 else None,
             linestyle="-",
             label=label
         )
 
     # Добавляем заголовок сверху с названием операции
-    plt.title(f"График времени выполнения операции: {op_name}", fontsize=14, fontweight='bold')
+    ax.set_title(f"График времени выполнения операции: {op_name}", fontsize=14, fontweight='bold')
 
     # Подписи осей по ГОСТ: на русском, шрифт обычно Times New Roman, но matplotlib –– стандарт.
-    plt.xlabel("Размер числа, условные единицы", fontsize=12)
-    plt.ylabel("Время выполнения, нс (логарифмический масштаб)", fontsize=12)
+    ax.set_xlabel("Размер числа, условные единицы", fontsize=12)
+    ax.set_ylabel("Время выполнения, нс (логарифмический масштаб)", fontsize=12)
 
     # Логарифмический масштаб по оси Y
-    plt.yscale("log")
+    ax.set_yscale("log")
 
     # Сетка
-    plt.grid(True, which="both", linestyle="--", linewidth=0.5)
+    ax.grid(True, which="both", linestyle="--", linewidth=0.5)
 
     # Легенда (обычно справа сверху, но можно внизу, в зависимости от ГОСТ; здесь справа)
-    plt.legend(loc="upper left", fontsize=10)
+    ax.legend(loc="upper left", fontsize=10)
 
     # Немного отступов, чтобы подписи не обрезались
-    plt.tight_layout()
+    fig = ax.figure
+    fig.tight_layout()
 
     # Сохраняем файл
-    filename = f"chart_{op_name}.png"
+    filename = f"chart_{op_name}.{fmt}"
     out_path = os.path.join(output_dir, filename)
-    plt.savefig(out_path, dpi=300)
-    plt.close()
+    if fmt == "svg":
+        # Векторный формат: без растеризации, dpi не нужен
+        fig.savefig(out_path, format="svg")
+    else:
+        # Быстрое сжатие PNG ценой чуть большего размера файла
+        fig.savefig(out_path, dpi=150, pil_kwargs={"compress_level": 1})
+
+def load_pyplot():
+    """
+    Импортируем matplotlib только там, где строятся графики:
+    запуск с --help или с неверными аргументами не тратит время на его загрузку.
+    """
+    import matplotlib
+
+    # Скрипт только сохраняет графики в файлы, интерактивный backend не нужен
+    matplotlib.use("Agg")
+    matplotlib.rcParams["path.simplify"] = True
+    matplotlib.rcParams["path.simplify_threshold"] = 1.0
+
+    import matplotlib.pyplot as plt
+    return plt
+
+# Оси, которые процесс-исполнитель переиспользует для всех своих графиков
+_worker_ax = None
+
+def _plot_one(task):
+    """
+    Точка входа для пула процессов: task = (op_name, sys_data, output_dir, fmt).
+    """
+    global _worker_ax
+    if _worker_ax is None:
+        _, _worker_ax = load_pyplot().subplots(figsize=(8, 6))
+    op_name, sys_data, output_dir, fmt = task
+    plot_operation(op_name, sys_data, output_dir, _worker_ax, fmt)
 
 def main():
     args = parse_args()
-    benchmarks = load_data(args.input)
-    data = collect_data(benchmarks)
+    data = collect_data(iter_benchmarks(args.input))
 
-    # Для каждой операции строим отдельный график
-    for op_name, sys_data in data.items():
-        # Если для какой-то системы нет данных – пропускаем
-        if "Binary" not in sys_data or "Factorial" not in sys_data:
-            continue
-        plot_operation(op_name, sys_data, args.output)
+    tasks = [(op_name, sys_data, args.output, args.format) for op_name, sys_data in data.items()]
+
+    # Графики независимы, поэтому строим их параллельно в отдельных процессах
+    if tasks:
+        with ProcessPoolExecutor(max_workers=min(len(tasks), os.cpu_count() or 1)) as executor:
+            list(executor.map(_plot_one, tasks))
 
     print("Graphs have been successfully saved in the directory:", args.output)
 